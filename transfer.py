@@ -58,8 +58,8 @@ import functools
 import glob
 import io
 import os
-import random
 import re
+import select
 import sys
 from enum import Enum, StrEnum
 from time import sleep, time
@@ -101,18 +101,15 @@ class NewlineValue(NamedTuple):
 
 
 class Newline(Enum):
+    # package data is converted as CPM_PLAINTEXT before it's hex-encoded, so there are no PACKAGE strings
     CRLF = NewlineValue(name='CRLF', strings={TransmissionFormat.BASIC_PLAINTEXT: '\r\n',
-                                              TransmissionFormat.CPM_PLAINTEXT: '\r\n',
-                                              TransmissionFormat.PACKAGE: '0D0A'})
+                                              TransmissionFormat.CPM_PLAINTEXT: '\r\n'})
     LFCR = NewlineValue(name='LFCR', strings={TransmissionFormat.BASIC_PLAINTEXT: '\n\r',
-                                              TransmissionFormat.CPM_PLAINTEXT: '\n\r',
-                                              TransmissionFormat.PACKAGE: '0A0D'})
+                                              TransmissionFormat.CPM_PLAINTEXT: '\n\r'})
     CR = NewlineValue(name='CR', strings={TransmissionFormat.BASIC_PLAINTEXT: '\r',
-                                          TransmissionFormat.CPM_PLAINTEXT: '\r',
-                                          TransmissionFormat.PACKAGE: '0D'})
+                                          TransmissionFormat.CPM_PLAINTEXT: '\r'})
     LF = NewlineValue(name='LF', strings={TransmissionFormat.BASIC_PLAINTEXT: '\n',
-                                          TransmissionFormat.CPM_PLAINTEXT: '\n',
-                                          TransmissionFormat.PACKAGE: '0A'})
+                                          TransmissionFormat.CPM_PLAINTEXT: '\n'})
 
 
 class Arguments(NamedTuple):
@@ -127,102 +124,226 @@ class Arguments(NamedTuple):
     receive: bool
 
 
+class WriteCombiningBuffer:
+    # accumulates small writes so that the connection sees fewer, larger writes
+    def __init__(self, destination: Union[io.BytesIO, serial.Serial], buffer_size: int) -> None:
+        self.destination: Union[io.BytesIO, serial.Serial] = destination
+        self.buffer_size: int = buffer_size
+        # one buffer is allocated up front and reused for every write
+        self.buffer: bytearray = bytearray(buffer_size)
+        self.buffered_byte_count: int = 0
+        # where we can, bypass pyserial's per-call overhead and write straight to the port's file descriptor
+        # (pyserial still configured the port, including flow control, which the OS honors);
+        # pyserial's Windows ports inherit io.RawIOBase.fileno, which raises, so those keep using write()
+        self.file_descriptor: Optional[int] = None
+        if isinstance(destination, serial.SerialBase):
+            try:
+                self.file_descriptor = destination.fileno()
+            except (io.UnsupportedOperation, AttributeError, ValueError):
+                self.file_descriptor = None
+
+    def write(self, data: bytes) -> None:
+        unbuffered: memoryview = memoryview(data)
+        while unbuffered:
+            count: int = min(len(unbuffered), self.buffer_size - self.buffered_byte_count)
+            self.buffer[self.buffered_byte_count:self.buffered_byte_count + count] = unbuffered[:count]
+            self.buffered_byte_count += count
+            unbuffered = unbuffered[count:]
+            if self.buffered_byte_count == self.buffer_size:
+                self.write_buffer()
+
+    def flush(self) -> None:
+        self.write_buffer()
+        self.destination.flush()
+
+    def write_buffer(self) -> None:
+        if self.buffered_byte_count == 0:
+            return
+        unwritten: memoryview = memoryview(self.buffer)[:self.buffered_byte_count]
+        self.buffered_byte_count = 0
+        if self.file_descriptor is None:
+            self.destination.write(unwritten)
+            return
+        while unwritten:
+            try:
+                unwritten = unwritten[os.write(self.file_descriptor, unwritten):]
+            except BlockingIOError:
+                # pyserial opens the port non-blocking, so wait until the OS can accept more
+                select.select([], [self.file_descriptor], [])
+
+
 CHARACTER_ENCODING: str = 'ascii'
 PADDING_CHARACTERS: FrozenSet[str] = frozenset({'\0', '\x1A'})  # NUL used by rc2014.co.uk packager; SUB used by ED.COM
 PREFERRED_PADDING: str = '\0'
 PREFERRED_PADDING_HEX: str = '\0'
 SERIAL_TIMEOUT_MS: int = 250
+SERIAL_WRITE_BUFFER_SIZE: int = 65536
 INTERFILE_DELAY_MS: int = 1000
+WRITE_COMBINING_BUFFER_SIZE: int = 4096
 DEBUG_REMOTE_RESPONSES: bool = False
+BINARY_FILE_EXTENSIONS: FrozenSet[str] = frozenset({'.BIN', '.COM', '.O'})
+TEXT_FILE_EXTENSIONS: FrozenSet[str] = frozenset({'.TXT', '.ME',                    # Plain text
+                                                  '.BAK',                           # Backup from text editor
+                                                  '.ASM', '.Z80', '.HEX', '.IHX',   # Assembly, Intel Hex
+                                                  '.LIS', '.LST', '.MAP', '.SYM',   # Linker & debugger files
+                                                  '.ADB', '.ADS',                   # Ada
+                                                  '.BAS',                           # BASIC
+                                                  '.C', '.H',                       # C
+                                                  '.F', '.F77', '.FOR',             # FORTRAN
+                                                  '.FTH', '.FS', '.4TH',            # Forth (n.b., '.F' is listed with FORTRAN)
+                                                  '.PAS',                           # Pascal
+                                                  '.CSV', '.JSON', '.XML',          # Text-based data files (n.b., '.DAT' might not be text)
+                                                  '.MD', '.TEX',                    # Markup files (including markdown)
+                                                  '.PKG'})                          # We can send packages as "basic-plaintext"
+
+ECHO_TRANSLATION_TABLE: Dict[int, str] = str.maketrans({'\\': '\\\\',
+                                                        '\t': '\\t\t',
+                                                        '\r': '\\r',
+                                                        '\n': '\\n\n',
+                                                        '\0': '\\0',
+                                                        '\x1A': '\\x1A'})
+# n.b., test a character against these strings rather than its ord() against the table, since reads can return ''
+ECHO_TRANSLATION_TABLE_KEYS: FrozenSet[str] = frozenset(chr(code) for code in ECHO_TRANSLATION_TABLE)
+
+# state carried between calls to echo_character and echo_string
+_echo_first_nibble: Optional[str] = None
+_echo_hextet_index: int = 0
+
+
+@functools.lru_cache(maxsize=None)
+def get_newline_translation_table(transmission_format: TransmissionFormat,
+                                  source_newlines: FrozenSet[Newline],
+                                  target_newline: Newline) -> Dict[int, str]:
+    final_newline: str = target_newline.value.strings[transmission_format]
+    return str.maketrans({newline.value.strings[transmission_format]: final_newline for newline in source_newlines})
+
+
+@functools.lru_cache(maxsize=None)
+def get_newline_pattern(transmission_format: TransmissionFormat,
+                        source_newlines: FrozenSet[Newline]) -> re.Pattern:
+    # try the two-character newlines first so that, e.g., CRLF isn't treated as CR followed by LF
+    newline_strings: List[str] = sorted((newline.value.strings[transmission_format] for newline in source_newlines),
+                                        key=len, reverse=True)
+    return re.compile('|'.join(re.escape(newline_string) for newline_string in newline_strings))
 
 
 def convert_newlines(string: str,
                      transmission_format: TransmissionFormat,
                      source_newlines: Iterable[Newline],
                      target_newline: Newline) -> str:
-    if not hasattr(convert_newlines, 'last_successful_temporary_newline'):
-        convert_newlines.last_successful_temporary_newline = '\u0081'  # used only if we can't use '\r' or '\n'
-    temporary_newline: str = convert_newlines.last_successful_temporary_newline
-    if Newline.LF in source_newlines or '\n' not in string:
-        temporary_newline = '\n'
-    elif Newline.CR in source_newlines or '\r' not in string:
-        temporary_newline = '\r'
-    else:
-        while temporary_newline in string:
-            temporary_newline = chr(random.randint(0x80, 0x100000))
-        convert_newlines.last_successful_temporary_newline = temporary_newline
+    if transmission_format == TransmissionFormat.PACKAGE:
+        # hex digits can't be searched for newlines ('0D' can straddle two hextets), so convert the raw bytes instead
+        raise ValueError('Newlines must be converted before package data is hex-encoded')
     cr: str = Newline.CR.value.strings[transmission_format]
     lf: str = Newline.LF.value.strings[transmission_format]
-    crlf: str = Newline.CRLF.value.strings[transmission_format]
-    lfcr: str = Newline.LFCR.value.strings[transmission_format]
+    # every newline contains CR or LF, so if neither is present then there's nothing to convert
+    if not source_newlines or (cr not in string and lf not in string):
+        return string
+    # converting a newline to itself is also nothing to convert
+    if set(source_newlines) == {target_newline}:
+        return string
+    # single-character newlines can be converted in one pass with a translation table
+    if Newline.CRLF not in source_newlines and Newline.LFCR not in source_newlines:
+        return string.translate(get_newline_translation_table(transmission_format,
+                                                              frozenset(source_newlines),
+                                                              target_newline))
     final_newline: str = target_newline.value.strings[transmission_format]
-    # convert CP/M, MS-DOS, Windows, etc
-    if Newline.CRLF in source_newlines:
-        string = string.replace(crlf, temporary_newline)
-    # convert BBC Micro
-    if Newline.LFCR in source_newlines:
-        string = string.replace(lfcr, temporary_newline)
-    # convert Apple, Commodore, etc
-    if Newline.CR in source_newlines:
-        string = string.replace(cr, temporary_newline)
-    # convert Unix
-    if Newline.LF in source_newlines:
-        string = string.replace(lf, temporary_newline)
-    string = string.replace(temporary_newline, final_newline)
-    return string
+    # n.b., final_newline has no backslashes, so it's safe to use as the replacement template
+    return get_newline_pattern(transmission_format, frozenset(source_newlines)).sub(final_newline, string)
 
 
 def echo_character(character: str,
                    file_format: Optional[FileFormat],
                    transmission_format: Optional[TransmissionFormat] = None) -> None:
-    if not hasattr(echo_character, 'first_nibble'):
-        echo_character.first_nibble = None
-    if not hasattr(echo_character, 'hextet_index'):
-        echo_character.hextet_index = 0
-    if character == '\\':
-        print('\\\\', end='', flush=True)
-    elif character == '\t':
-        print('\\t', end='\t', flush=True)
-    elif character == '\r':
-        print('\\r', end='', flush=True)
-    elif character == '\n':
-        print('\\n', end='\n', flush=True)
-    elif character == '\0':
-        print('\\0', end='', flush=True)
-    elif character == '\x1A':
-        print('\\x1A', end='', flush=True)
+    global _echo_first_nibble, _echo_hextet_index
+    if character in ECHO_TRANSLATION_TABLE_KEYS:
+        print(character.translate(ECHO_TRANSLATION_TABLE), end='', flush=True)
     elif transmission_format == TransmissionFormat.PACKAGE:
-        if echo_character.first_nibble is None:
-            echo_character.first_nibble = character
-            print(echo_character.first_nibble, end='', flush=True)
+        if _echo_first_nibble is None:
+            _echo_first_nibble = character
+            print(_echo_first_nibble, end='', flush=True)
         else:
             second_nibble = character
-            echo_character.hextet_index = (echo_character.hextet_index + 1) % 16
+            _echo_hextet_index = (_echo_hextet_index + 1) % 16
             print(character, end=' ', flush=True)
-            if file_format == FileFormat.TEXT and echo_character.first_nibble + second_nibble == '0A':
+            if file_format == FileFormat.TEXT and _echo_first_nibble + second_nibble == '0A':
                 print('', flush=True)
-            if file_format == FileFormat.BINARY and echo_character.hextet_index == 8:
+            if file_format == FileFormat.BINARY and _echo_hextet_index == 8:
                 print('  ', end='', flush=True)
-            if file_format == FileFormat.BINARY and echo_character.hextet_index == 0:
+            if file_format == FileFormat.BINARY and _echo_hextet_index == 0:
                 print('', flush=True)
-            echo_character.first_nibble = None
+            _echo_first_nibble = None
     else:
         print(character, end='', flush=True)
 
 
+def echo_string(string: str,
+                file_format: Optional[FileFormat],
+                transmission_format: Optional[TransmissionFormat] = None) -> None:
+    global _echo_hextet_index
+    if transmission_format != TransmissionFormat.PACKAGE:
+        print(string.translate(ECHO_TRANSLATION_TABLE), end='', flush=True)
+    elif _echo_first_nibble is not None or len(string) % 2 == 1 or not string.isalnum():
+        # not simply a sequence of hextets, so fall back to the character-by-character state machine
+        for character in string:
+            echo_character(character, file_format, transmission_format)
+    else:
+        hextets: List[str] = [string[i:i + 2] for i in range(0, len(string), 2)]
+        if file_format == FileFormat.BINARY:
+            # 16 hextets per line, with an extra gap after the 8th
+            separated_hextets: List[str] = []
+            for hextet in hextets:
+                _echo_hextet_index = (_echo_hextet_index + 1) % 16
+                separated_hextets.append(hextet + ('   ' if _echo_hextet_index == 8
+                                                   else ' \n' if _echo_hextet_index == 0
+                                                   else ' '))
+            print(''.join(separated_hextets), end='', flush=True)
+        else:
+            _echo_hextet_index = (_echo_hextet_index + len(hextets)) % 16
+            echo: str = ' '.join(hextets) + ' '
+            if file_format == FileFormat.TEXT:
+                # each pair is followed by a space, so '0A ' can only be a newline hextet
+                echo = echo.replace('0A ', '0A \n')
+            print(echo, end='', flush=True)
+
+
+def transmit_bytes(data: bytes,
+                   destination: Optional[Union[io.BytesIO, serial.Serial, WriteCombiningBuffer]],
+                   ms_delay: int,
+                   drain: bool = True) -> None:
+    if ms_delay > 0:
+        # the user asked for the characters to be paced, so send them one at a time
+        delay_seconds: float = ms_delay / 1000.0
+        for index in range(len(data)):
+            if destination is not None:
+                destination.write(data[index:index + 1])
+                # let the character leave the UART before the delay starts, so that the delay is a real gap on the wire
+                destination.flush()
+            sleep(delay_seconds)
+    elif destination is not None:
+        destination.write(data)
+        if drain:
+            # drain once per string (not per character) so that any response we then wait for isn't outrun by our data
+            destination.flush()
+
+
 def send_string(string: str,
-                destination: Optional[Union[io.BytesIO, serial.Serial]],
+                destination: Optional[Union[io.BytesIO, serial.Serial, WriteCombiningBuffer]],
                 ms_delay: int,
                 echo_transmission: bool,
                 file_format: Optional[FileFormat] = None,
-                transmission_format: Optional[TransmissionFormat] = None) -> None:
-    for character in string:
-        if echo_transmission:
+                transmission_format: Optional[TransmissionFormat] = None,
+                drain: bool = True) -> None:
+    if echo_transmission and ms_delay > 0:
+        # the characters are paced, so echo each one as it's sent to keep the echo in step with the transmission
+        for character in string:
             echo_character(character, file_format, transmission_format)
-        if destination is not None:
-            destination.write(character.encode())
-            destination.flush()
-        sleep(ms_delay / 1000.0)
+            transmit_bytes(character.encode(), destination, ms_delay, drain)
+        return
+    # otherwise the whole string is sent at once, so the console echo is formatted separately and ahead of it
+    if echo_transmission:
+        echo_string(string, file_format, transmission_format)
+    transmit_bytes(string.encode(), destination, ms_delay, drain)
 
 
 def flush_receive_buffer(source: Optional[Union[io.BytesIO, serial.Serial]], termination_byte: bytes = b'') -> str:
@@ -412,26 +533,30 @@ def receive_package_file(original_file: str,
         # Save the data
         buffer.seek(0)
         file_contents: str = buffer.read()
-        file_bytes: List[int] = [int(file_contents[i:i+2], 16) for i in range(0, len(file_contents), 2)]
-        byte_count: int = len(file_bytes) & 0xFF
-        byte_sum: int = sum(file_bytes) & 0xFF
-        if length != byte_count:
-            print(f'Length error! Package reports {length:02X}; Found {byte_count:02X}')
-        elif checksum != byte_sum:
-            print(f'Checksum error! Package reports {checksum:02X}; Found {byte_sum:02X}')
+        try:
+            file_bytes: bytes = bytes.fromhex(file_contents)
+        except ValueError:
+            # e.g., a character was dropped on the link, leaving an odd number of hex digits
+            print(f'Format error! Package data is not whole hexadecimal bytes; Found {len(file_contents)} characters')
         else:
-            if file_format == FileFormat.TEXT:
-                file_characters: str = convert_newlines(''.join(chr(byte) for byte in file_bytes),
-                                                        TransmissionFormat.CPM_PLAINTEXT, source_newlines, target_newline)
-                end_of_file: int = 0
-                while file_characters[end_of_file - 1] in PADDING_CHARACTERS:
-                    end_of_file -= 1
-                with open(target_file, 'wt') as file:
-                    file.write(file_characters if end_of_file == 0 else file_characters[:end_of_file])
+            byte_count: int = len(file_bytes) & 0xFF
+            byte_sum: int = sum(file_bytes) & 0xFF
+            if length != byte_count:
+                print(f'Length error! Package reports {length:02X}; Found {byte_count:02X}')
+            elif checksum != byte_sum:
+                print(f'Checksum error! Package reports {checksum:02X}; Found {byte_sum:02X}')
             else:
-                with open(target_file, 'wb') as file:
-                    for byte in file_bytes:
-                        file.write(byte.to_bytes(1, byteorder=sys.byteorder))
+                if file_format == FileFormat.TEXT:
+                    file_characters: str = convert_newlines(file_bytes.decode('latin-1'),
+                                                            TransmissionFormat.CPM_PLAINTEXT, source_newlines, target_newline)
+                    end_of_file: int = 0
+                    while file_characters[end_of_file - 1] in PADDING_CHARACTERS:
+                        end_of_file -= 1
+                    with open(target_file, 'wt') as file:
+                        file.write(file_characters if end_of_file == 0 else file_characters[:end_of_file])
+                else:
+                    with open(target_file, 'wb') as file:
+                        file.write(file_bytes)
     flush_receive_buffer(source)
 
 
@@ -441,10 +566,12 @@ def send_basic_plaintext_file(original_file: str,
                               source_newlines: Iterable[Newline],
                               target_newline: Newline,
                               echo_transmission: bool) -> None:
+    # convert the whole file in one pass (the file is opened in text mode, so its newlines are already '\n')
     with open(original_file, 'rt') as source:
-        for line in source.readlines():
-            line = convert_newlines(line, TransmissionFormat.BASIC_PLAINTEXT, source_newlines, target_newline)
-            send_string(line, destination, ms_delay, echo_transmission, FileFormat.TEXT, TransmissionFormat.BASIC_PLAINTEXT)
+        file_contents: str = convert_newlines(source.read(), TransmissionFormat.BASIC_PLAINTEXT, source_newlines, target_newline)
+    # send a line at a time so that the echo keeps pace with the transmission
+    for line in file_contents.splitlines(keepends=True):
+        send_string(line, destination, ms_delay, echo_transmission, FileFormat.TEXT, TransmissionFormat.BASIC_PLAINTEXT)
 
 
 def send_cpm_plaintext_file(original_file: str,
@@ -455,21 +582,23 @@ def send_cpm_plaintext_file(original_file: str,
                             source_newlines: Iterable[Newline],
                             target_newline: Newline,
                             echo_transmission: bool) -> None:
+    # convert the whole file in one pass (the file is opened in text mode, so its newlines are already '\n')
     with open(original_file, 'rt') as source:
-        send_cpm_command(f'USER {user_number}\n', destination, ms_delay, echo_transmission)
-        # remove the original, if it exists
-        send_cpm_command(f'ERA {target_file}\n', destination, ms_delay, echo_transmission)
-        send_cpm_command(f'C:ED {target_file.upper()}\n', destination, ms_delay, echo_transmission)
-        # capital-I seems to force all-uppercase; lowercase-I seems to preserve the case
-        send_string('i\n', destination, ms_delay, echo_transmission)
-        for line in source.readlines():
-            # ED.COM seems to convert '\r' to '\r\n', so '\r\n' becomes '\r\n\n' (cf., receive_basic/cpm_plaintext_file)
-            line = convert_newlines(line, TransmissionFormat.CPM_PLAINTEXT, source_newlines, Newline.CR)
-            send_string(line, destination, ms_delay, echo_transmission, FileFormat.TEXT, TransmissionFormat.CPM_PLAINTEXT)
-        send_string('\x1AE\n\n', destination, ms_delay, echo_transmission)
-        flush_receive_buffer(destination)
-        # erase the empty backup file
-        send_cpm_command(f'ERA {target_file.split('.')[0]}.BAK\n', destination, ms_delay, echo_transmission)
+        # ED.COM seems to convert '\r' to '\r\n', so '\r\n' becomes '\r\n\n' (cf., receive_basic/cpm_plaintext_file)
+        file_contents: str = convert_newlines(source.read(), TransmissionFormat.CPM_PLAINTEXT, source_newlines, Newline.CR)
+    send_cpm_command(f'USER {user_number}\n', destination, ms_delay, echo_transmission)
+    # remove the original, if it exists
+    send_cpm_command(f'ERA {target_file}\n', destination, ms_delay, echo_transmission)
+    send_cpm_command(f'C:ED {target_file.upper()}\n', destination, ms_delay, echo_transmission)
+    # capital-I seems to force all-uppercase; lowercase-I seems to preserve the case
+    send_string('i\n', destination, ms_delay, echo_transmission)
+    # send a line at a time so that the echo keeps pace with the transmission
+    for line in file_contents.splitlines(keepends=True):
+        send_string(line, destination, ms_delay, echo_transmission, FileFormat.TEXT, TransmissionFormat.CPM_PLAINTEXT)
+    send_string('\x1AE\n\n', destination, ms_delay, echo_transmission)
+    flush_receive_buffer(destination)
+    # erase the empty backup file
+    send_cpm_command(f'ERA {target_file.split('.')[0]}.BAK\n', destination, ms_delay, echo_transmission)
 
 
 def send_package_file(original_file: str,
@@ -482,37 +611,44 @@ def send_package_file(original_file: str,
                       target_newline: Newline,
                       echo_transmission: bool) -> None:
     with open(original_file, 'rb') as source:
-        send_string(f'A:DOWNLOAD {target_file}\nU{user_number}\n:', destination, ms_delay, echo_transmission)
-        byte_count: int = 0
-        byte_sum: int = 0
-        block_bytes: bytes = source.read(128)
-        while block_bytes:
-            block_string: str = ''.join(f'{byte:02X}' for byte in block_bytes)
-            if file_format == FileFormat.TEXT:
-                block_string = convert_newlines(block_string, TransmissionFormat.PACKAGE, source_newlines, target_newline)
-            byte_count += len(block_string) // 2
-            byte_sum += functools.reduce(lambda a, b: a + b,
-                                         [int(block_string[i:i + 2], 16) for i in range(0, len(block_string), 2)])
-            send_string(block_string, destination, ms_delay, echo_transmission, file_format, TransmissionFormat.PACKAGE)
-            block_bytes = source.read(128)
-        # if we need an end of file marker, we need at least one SUB character
-        padding_needed: int = 128 - (byte_count % 128)
-        # but if this CP/M version is happy with file length as a multiple of 128, no marker is needed
-        if PREFERRED_PADDING == '\0' and padding_needed == 128:
-            padding_needed = 0
-        byte_count += padding_needed
-        byte_sum += padding_needed * ord(PREFERRED_PADDING)
-        send_string(''.join(f'{ord(PREFERRED_PADDING):02X}' for _ in range(padding_needed)),
-                    destination, ms_delay, echo_transmission, file_format, TransmissionFormat.PACKAGE)
-        send_string(f'>{(byte_count & 0xFF):02X}{(byte_sum & 0xFF):02X}', destination, ms_delay, echo_transmission)
-        if destination is not None:
-            remote_computer_response: str = receive_plaintext(destination, io.StringIO(), b'ignored', False)
-            if DEBUG_REMOTE_RESPONSES:
-                print('[[')
-                print(remote_computer_response)
-                print(']]', flush=True)
-            elif isinstance(destination, serial.Serial):
-                print(f'Response: {' '.join(remote_computer_response.splitlines())}', flush=True)
+        file_contents: bytes = source.read()
+    if file_format == FileFormat.TEXT:
+        # convert newlines in the raw bytes (latin-1 maps each byte to one character and back) rather than in the hex
+        file_contents = convert_newlines(file_contents.decode('latin-1'), TransmissionFormat.CPM_PLAINTEXT,
+                                         source_newlines, target_newline).encode('latin-1')
+    # encode the whole file at once; we'll still send it one 128-byte block (256 hex digits) at a time
+    file_hex: str = file_contents.hex().upper()
+    # unless the user asked for the characters to be paced, let the header, blocks, and trailer share writes
+    block_destination: Optional[Union[io.BytesIO, serial.Serial, WriteCombiningBuffer]] = \
+        WriteCombiningBuffer(destination, WRITE_COMBINING_BUFFER_SIZE) \
+            if destination is not None and ms_delay == 0 else destination
+    send_string(f'A:DOWNLOAD {target_file}\nU{user_number}\n:', block_destination, ms_delay, echo_transmission,
+                drain=False)
+    byte_count: int = len(file_contents)
+    byte_sum: int = sum(file_contents)
+    # the destination is drained once, after the trailer
+    for start in range(0, len(file_hex), 256):
+        send_string(file_hex[start:start + 256], block_destination, ms_delay, echo_transmission,
+                    file_format, TransmissionFormat.PACKAGE, drain=False)
+    # if we need an end of file marker, we need at least one SUB character
+    padding_needed: int = 128 - (byte_count % 128)
+    # but if this CP/M version is happy with file length as a multiple of 128, no marker is needed
+    if PREFERRED_PADDING == '\0' and padding_needed == 128:
+        padding_needed = 0
+    byte_count += padding_needed
+    byte_sum += padding_needed * ord(PREFERRED_PADDING)
+    send_string(f'{ord(PREFERRED_PADDING):02X}' * padding_needed, block_destination, ms_delay, echo_transmission,
+                file_format, TransmissionFormat.PACKAGE, drain=False)
+    # the trailer joins the padding in the write-combining buffer, and sending it flushes both in one write
+    send_string(f'>{(byte_count & 0xFF):02X}{(byte_sum & 0xFF):02X}', block_destination, ms_delay, echo_transmission)
+    if destination is not None:
+        remote_computer_response: str = receive_plaintext(destination, io.StringIO(), b'ignored', False)
+        if DEBUG_REMOTE_RESPONSES:
+            print('[[')
+            print(remote_computer_response)
+            print(']]', flush=True)
+        elif isinstance(destination, serial.Serial):
+            print(f'Response: {' '.join(remote_computer_response.splitlines())}', flush=True)
 
 
 def receive_files(arguments: Arguments,
@@ -557,14 +693,12 @@ def receive_files(arguments: Arguments,
                 raise ValueError(f'Unknown transmission format: {arguments.transmission_format}')
         stop_time: float = time()
         sys.stdout.flush()
-        if arguments.serial_port is None:
-            print(f'\nSimulated {arguments.transmission_format} reception of', end=' ')
-        else:
-            print(f'\n\n{arguments.transmission_format.capitalize()} reception of', end=' ')
-        print(f'{file.original_path}', end=' ')
-        if arguments.serial_port is not None:
-            print(f'from {arguments.serial_port.name}', end=' ')
-        print(f'({file_number + 1}/{file_count}) completed in {round(stop_time - start_time, 3)} seconds.'
+        # assemble the report so that it's written all at once
+        report: str = (f'\nSimulated {arguments.transmission_format} reception of {file.original_path} '
+                       if arguments.serial_port is None
+                       else f'\n\n{arguments.transmission_format.capitalize()} reception of {file.original_path} '
+                            f'from {arguments.serial_port.name} ')
+        print(f'{report}({file_number + 1}/{file_count}) completed in {round(stop_time - start_time, 3)} seconds.'
               f' File format: {file.format} '
               f'(specified as {"inferred" if file.format_inferred else file.format})', flush=True)
 
@@ -618,14 +752,12 @@ def send_files(arguments: Arguments,
             pyperclip.copy(destination.read().decode(CHARACTER_ENCODING))
             if not pyperclip.is_available():
                 print('\nClipboard is unavailable.')
-        if arguments.serial_port is None:
-            print(f'\nSimulated {arguments.transmission_format} transmission of', end=' ')
-        else:
-            print(f'\n\n{arguments.transmission_format.capitalize()} transmission of', end=' ')
-        print(f'{file.target_name}', end=' ')
-        if arguments.serial_port is not None:
-            print(f'to {arguments.serial_port.name}', end=' ')
-        print(f'({file_number + 1}/{file_count}) completed in {round(stop_time - start_time, 3)} seconds.'
+        # assemble the report so that it's written all at once
+        report: str = (f'\nSimulated {arguments.transmission_format} transmission of {file.target_name} '
+                       if arguments.serial_port is None
+                       else f'\n\n{arguments.transmission_format.capitalize()} transmission of {file.target_name} '
+                            f'to {arguments.serial_port.name} ')
+        print(f'{report}({file_number + 1}/{file_count}) completed in {round(stop_time - start_time, 3)} seconds.'
               f' File format: {file.format} '
               f'(specified as {"inferred" if file.format_inferred else file.format})', flush=True)
 
@@ -674,6 +806,7 @@ def expand_wildcards(filespec: str,
 
 
 # TODO: warn if (truncated) filename matches another filename
+@functools.lru_cache(maxsize=None)  # don't ask the user to rename the same file twice
 def truncate_filename(filename: str,
                       receiving_file: bool) -> str:
     new_filename: str = ''
@@ -711,31 +844,19 @@ def truncate_filename(filename: str,
     return new_filename
 
 
+@functools.lru_cache(maxsize=None)  # don't re-read the same file to infer its format
 def get_file_format(filename: str,
                     specified_file_format: Optional[FileFormat],
                     transmission_format: TransmissionFormat,
                     receiving_file: bool) -> FileFormat:
-    binary_file_extensions = {'.BIN', '.COM', '.O'}
-    text_file_extensions   = {'.TXT', '.ME',                    # Plain text
-                              '.BAK',                           # Backup from text editor
-                              '.ASM', '.Z80', '.HEX', '.IHX',   # Assembly, Intel Hex
-                              '.LIS', '.LST', '.MAP', '.SYM',   # Linker & debugger files
-                              '.ADB', '.ADS',                   # Ada
-                              '.BAS',                           # BASIC
-                              '.C', '.H',                       # C
-                              '.F', '.F77', '.FOR',             # FORTRAN
-                              '.F', '.FTH', '.FS', '.4TH',      # Forth
-                              '.PAS',                           # Pascal
-                              '.CSV', '.JSON', '.XML'           # Text-based data files (n.b., '.DAT' might not be text)
-                              '.MD', '.TEX',                    # Markup files (including markdown)
-                              '.PKG'}                           # We can send packages as "basic-plaintext"
     if transmission_format in {TransmissionFormat.BASIC_PLAINTEXT, TransmissionFormat.CPM_PLAINTEXT}:
         return FileFormat.TEXT
     if specified_file_format is not None:
         return specified_file_format
-    if any(filename.upper().endswith(extension.upper()) for extension in text_file_extensions):
+    extension: str = os.path.splitext(filename)[1].upper()
+    if extension in TEXT_FILE_EXTENSIONS:
         return FileFormat.TEXT
-    if any(filename.upper().endswith(extension.upper()) for extension in binary_file_extensions):
+    if extension in BINARY_FILE_EXTENSIONS:
         return FileFormat.BINARY
     if receiving_file:
         return FileFormat.BINARY    # The worst that'll happen is that we have '\r\n' when we only need '\n', and there'll be padding characters at the end of the file
@@ -743,11 +864,8 @@ def get_file_format(filename: str,
     try:
         with open(filename, 'rb') as file:
             first_kilobyte: bytes = file.read(1024)
-            first_kilobyte.decode(CHARACTER_ENCODING)
-            # if the first KB can be decoded as text, then it's probably text
-            file_format = FileFormat.TEXT
-    except UnicodeDecodeError:
-        file_format = FileFormat.BINARY
+            # if the first KB is entirely ASCII, then it's probably text
+            file_format = FileFormat.TEXT if first_kilobyte.isascii() else FileFormat.BINARY
     except FileNotFoundError:
         # if the file doesn't exist, then the format doesn't matter
         # (the absence of the file is handled elsewhere)
@@ -892,6 +1010,9 @@ def main():
                                        rtscts=arguments.serial_port.flow_control_enabled,
                                        exclusive=arguments.serial_port.exclusive_port_access_mode,
                                        timeout=SERIAL_TIMEOUT_MS / 1000.0)
+            if hasattr(connection, 'set_buffer_size'):
+                # only some platforms (i.e., Windows) let us enlarge the OS's transmit buffer
+                connection.set_buffer_size(rx_size=4096, tx_size=SERIAL_WRITE_BUFFER_SIZE)
             for file in arguments.files:
                 filenames: Set[str] = expand_wildcards(file.original_path,
                                                        connection,